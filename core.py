@@ -0,0 +1,351 @@
+import streamlit as st
+from langchain_groq import ChatGroq
+import os
+import re
+import asyncio
+import concurrent.futures
+import threading
+import hashlib
+import functools
+from typing import List, Dict, Optional, Tuple
+import orjson
+from diskcache import Cache
+from dotenv import load_dotenv
+
+load_dotenv()
+_GROQ_API_KEY = os.getenv("GROQ_API_KEY")
+
+# Identical prompts are answered from cache for a day.
+CACHE_TTL = 24 * 60 * 60
+
+@st.cache_resource
+def initialize_llm():
+    """Initialize the Groq LLM once and share it across sessions and reruns."""
+    return ChatGroq(
+        groq_api_key=_GROQ_API_KEY,
+        model_name="llama3-8b-8192",
+        temperature=0.5,
+        max_tokens=4096,
+    )
+
+# Output budget per request, sized to what each prompt actually returns
+MAX_TOKENS = {
+    "prerequisites": 256,
+    "subtopics": 256,
+    "roadmap": 1200,
+    "resources": 1500,
+    "content": 700,
+    "chatbot": 400,
+}
+
+# Responses persisted on disk so restarts and new sessions reuse them
+LLM_CACHE = Cache("./.llm_cache")
+
+def llm_cache_key(llm, prompt: str, **params) -> str:
+    """Hash the model settings, per-call overrides and prompt into a disk cache key."""
+    settings = {"model": llm.model_name, "temperature": llm.temperature, **params}
+    raw = f"{sorted(settings.items())}\x00{prompt}"
+    return hashlib.sha256(raw.encode()).hexdigest()
+
+# Lower temperatures tried in turn when a response is not valid JSON
+JSON_RETRY_TEMPERATURES = (0.2, 0.0)
+
+async def cached_ainvoke_json(dispatcher, prompt: str, ttl: int = CACHE_TTL, **params) -> str:
+    """Return a JSON response for a prompt, retrying until it parses."""
+    # Only parseable answers are cached, and retries always reach the LLM
+    # diskcache blocks on SQLite, so keep it off the loop shared by every session
+    loop = asyncio.get_running_loop()
+    key = llm_cache_key(dispatcher.llm, prompt, **params)
+    text = await loop.run_in_executor(None, LLM_CACHE.get, key)
+    if text is not None:
+        return text
+    attempt = dict(params)
+    message = await dispatcher.submit(prompt, **attempt)
+    # Malformed answers retry at a lower temperature, truncated ones with a larger budget
+    for temperature in JSON_RETRY_TEMPERATURES:
+        if extract_json(message.content) is not None:
+            break
+        if message.response_metadata.get("finish_reason") == "length":
+            # A truncated answer needs a larger budget, not a different sample
+            if "max_tokens" not in attempt:
+                break
+            attempt["max_tokens"] *= 2
+        else:
+            attempt["temperature"] = temperature
+        message = await dispatcher.submit(prompt, **attempt)
+    text = message.content
+    if extract_json(text) is not None:
+        await loop.run_in_executor(None, functools.partial(LLM_CACHE.set, key, text, expire=ttl))
+    return text
+
+def cached_stream(llm, prompt: str, ttl: int = CACHE_TTL, **params):
+    """Yield the response text for a prompt, streaming from the LLM on a cache miss."""
+    key = llm_cache_key(llm, prompt, **params)
+    text = LLM_CACHE.get(key)
+    if text is not None:
+        yield text
+        return
+    chunks = []
+    for chunk in llm.stream(prompt, **params):
+        chunks.append(chunk.content)
+        yield chunk.content
+    LLM_CACHE.set(key, "".join(chunks), expire=ttl)
+
+def get_prerequisites_prompt(topic: str) -> str:
+    return f"""You are a helpful educational assistant. For the topic '{topic}', list exactly 3-5 prerequisite topics.
+    
+    Rules:
+    1. Response must be valid JSON
+    2. Each prerequisite must have a topic name and difficulty level
+    3. Difficulty must be one of: "Basic", "Intermediate", "Advanced"
+    
+    Return only the JSON in this exact format, nothing else:
+    {{
+        "prerequisites": [
+            {{"topic": "example topic", "level": "Basic"}},
+            {{"topic": "another topic", "level": "Intermediate"}}
+        ]
+    }}"""
+
+def get_chatbot_prompt(topic: str, context: str) -> str:
+    context_line = f"Use this context about the user's learning journey: {context}" if context else ""
+    return f"""You are a helpful educational assistant specializing in {topic}. 
+    {context_line}
+    
+    Provide clear, concise answers focused on {topic} and related concepts in 150 words.
+    If asked about topics outside your expertise, guide the conversation back to {topic}."""
+    
+def get_subtopics_prompt(topic: str) -> str:
+    return f"""You are a helpful educational assistant. For the topic '{topic}', list exactly 5 key subtopics to study.
+    
+    Rules:
+    1. Response must be valid JSON
+    2. Each subtopic should be brief but descriptive
+    
+    Return only the JSON in this exact format, nothing else:
+    {{
+        "subtopics": [
+            "subtopic 1",
+            "subtopic 2",
+            "subtopic 3",
+            "subtopic 4",
+            "subtopic 5"
+        ]
+    }}"""
+
+# Short keys in the roadmap schema keep the generated JSON small
+ROADMAP_KEYS = {
+    "w": "week",
+    "g": "goals",
+    "a": "activities",
+    "e": "exercises",
+    "p": "project",
+    "h": "hours_per_week",
+}
+
+# Values used when the model leaves a key out of a roadmap week
+ROADMAP_WEEK_DEFAULTS = {
+    "goals": [],
+    "activities": [],
+    "exercises": [],
+    "project": "",
+    "hours_per_week": "N/A",
+}
+
+def get_roadmap_prompt(topic: str, subtopics: List[str]) -> str:
+    subtopics_str = ", ".join(subtopics)
+    return f"""Create a 4-6 week learning roadmap for '{topic}' focusing on: {subtopics_str}
+
+    Return only valid JSON in this exact format, nothing else.
+    Keys: w=week number, g=goals, a=activities, e=practice exercises, p=project, h=hours per week.
+    {{"r": [{{"w": 1, "g": ["goal"], "a": ["activity"], "e": ["exercise"], "p": "project", "h": 10}}]}}"""
+
+def get_content_prompt(subtopics: List[str]) -> str:
+    subtopics_str = ", ".join(subtopics)
+    return f"""Provide a concise learning summary for these subtopics: {subtopics_str}
+
+    For each subtopic, under its own heading:
+    1. A one-sentence overview
+    2. 2-3 key concepts, one bullet each, with a difficulty rating (Basic/Intermediate/Advanced)
+    3. One common pitfall and how to avoid it
+    
+    Be brief: respond in under 400 words in total."""
+
+def get_resources_prompt(topic: str, subtopics: List[str]) -> str:
+    subtopics_str = ", ".join(subtopics)
+    return f"""You are a helpful educational assistant. Provide learning resources for '{topic}' focusing on: {subtopics_str}
+
+    Rules:
+    1. Response must be valid JSON
+    2. Include exactly 3 textbooks and 3 papers
+    3. Include exactly 1 YouTube video (full URL) for '{topic}' focusing on: {subtopics_str}
+    4. Include 2 online courses
+    5. Include 2 interactive learning platforms
+    
+    Return only the JSON in this exact format, nothing else:
+    {{
+        "textbooks": [
+            {{"title": "Book Title 1", "author": "Author Name", "link": "https://example.com/book1"}},
+            {{"title": "Book Title 2", "author": "Author Name", "link": "https://example.com/book2"}},
+            {{"title": "Book Title 3", "author": "Author Name", "link": "https://example.com/book3"}}
+        ],
+        "papers": [
+            {{"title": "Paper Title 1", "authors": "Authors", "link": "https://example.com/paper1"}},
+            {{"title": "Paper Title 2", "authors": "Authors", "link": "https://example.com/paper2"}},
+            {{"title": "Paper Title 3", "authors": "Authors", "link": "https://example.com/paper3"}}
+        ],
+        "youtube": "https://youtube.com/watch?v=FULL_VIDEO_URL",
+        "courses": [
+            {{"title": "Course Title 1", "platform": "Platform Name", "link": "https://example.com/course1"}},
+            {{"title": "Course Title 2", "platform": "Platform Name", "link": "https://example.com/course2"}}
+        ],
+        "interactive_platforms": [
+            {{"name": "Platform Name 1", "description": "Description", "link": "https://example.com/platform1"}},
+            {{"name": "Platform Name 2", "description": "Description", "link": "https://example.com/platform2"}}
+        ]
+    }}"""
+
+# Outermost JSON object in an LLM response, ignoring any surrounding prose.
+# Matched on bytes so the slice goes straight to orjson without decoding.
+JSON_OBJECT_PATTERN = re.compile(rb"\{[\s\S]*\}")
+
+# Fallbacks shown when a response cannot be parsed
+PREREQUISITES_DEFAULT = {"prerequisites": [{"topic": "Basic concepts", "level": "Basic"}]}
+SUBTOPICS_DEFAULT = {"subtopics": ["Basic concepts"]}
+RESOURCES_DEFAULT = {
+    "textbooks": [{"title": "Resource not available", "author": "N/A", "link": "#"}],
+    "papers": [{"title": "Resource not available", "authors": "N/A", "link": "#"}],
+    "youtube": "https://youtube.com/watch?v=dQw4w9WgXcQ",
+    "courses": [{"title": "Resource not available", "platform": "N/A", "link": "#"}],
+    "interactive_platforms": [{"name": "Resource not available", "description": "N/A", "link": "#"}]
+}
+
+def extract_json(response: str) -> Optional[Dict]:
+    """Return the JSON object in an LLM response, or None if there is none."""
+    match = JSON_OBJECT_PATTERN.search(response.encode())
+    if match:
+        try:
+            return orjson.loads(match.group(0))
+        except orjson.JSONDecodeError:
+            pass
+    return None
+
+def parse_json_response(response: str, default: Optional[Dict] = None) -> Dict:
+    """Parse the JSON object in an LLM response, falling back to default."""
+    data = extract_json(response)
+    if data is not None:
+        return data
+    st.warning("Failed to parse response. Using simplified format.")
+    return default if default is not None else {}
+
+def expand_roadmap(data: Dict) -> Dict:
+    """Map the compact roadmap schema back to the keys used for display."""
+    weeks = data.get("r", data.get("roadmap", []))
+    if not isinstance(weeks, list):
+        weeks = []
+    # Skip anything the model returned that is not a week object
+    weeks = [week for week in weeks if isinstance(week, dict)]
+    return {
+        "roadmap": [
+            {
+                "week": number,
+                **ROADMAP_WEEK_DEFAULTS,
+                **{ROADMAP_KEYS.get(k, k): v for k, v in week.items()},
+            }
+            for number, week in enumerate(weeks, start=1)
+        ]
+    }
+
+@st.cache_resource
+def get_event_loop() -> asyncio.AbstractEventLoop:
+    """Start a long-lived event loop for async LLM calls."""
+    # The shared client's async connection pool is bound to the loop that opened it
+    loop = asyncio.new_event_loop()
+    threading.Thread(target=loop.run_forever, daemon=True).start()
+    return loop
+
+class RequestDispatcher:
+    """Send LLM requests from all sessions over the shared client with a concurrency cap."""
+
+    def __init__(self, llm, loop: asyncio.AbstractEventLoop, max_concurrency: int = 8):
+        self.llm = llm
+        self.loop = loop
+        # At most max_concurrency requests are in flight, keeping concurrent users within
+        # Groq's rate limits. Streaming calls from cached_stream go to the client directly
+        # and are not counted. The semaphore must be created on the loop it is used from.
+        self._semaphore = asyncio.run_coroutine_threadsafe(
+            self._create_semaphore(max_concurrency), loop
+        ).result()
+
+    @staticmethod
+    async def _create_semaphore(limit: int) -> asyncio.Semaphore:
+        return asyncio.Semaphore(limit)
+
+    async def submit(self, prompt: str, **params):
+        """Send a prompt, with optional per-call model overrides, and return the response message."""
+        async with self._semaphore:
+            return await self.llm.ainvoke(prompt, **params)
+
+@st.cache_resource
+def get_dispatcher() -> RequestDispatcher:
+    """Create the request dispatcher shared by every session."""
+    return RequestDispatcher(initialize_llm(), get_event_loop())
+
+async def gather_topic_outline(dispatcher: RequestDispatcher, topic: str):
+    """Request the prerequisites and subtopics concurrently."""
+    return await asyncio.gather(
+        cached_ainvoke_json(
+            dispatcher, get_prerequisites_prompt(topic), max_tokens=MAX_TOKENS["prerequisites"]
+        ),
+        cached_ainvoke_json(
+            dispatcher, get_subtopics_prompt(topic), max_tokens=MAX_TOKENS["subtopics"]
+        ),
+    )
+
+def fetch_topic_outline(topic: str) -> Tuple[str, str]:
+    """Fetch the raw prerequisites and subtopics responses for a topic."""
+    future = asyncio.run_coroutine_threadsafe(
+        gather_topic_outline(get_dispatcher(), topic),
+        get_event_loop(),
+    )
+    prerequisites, subtopics = future.result()
+    return prerequisites, subtopics
+
+async def gather_learning_material(dispatcher: RequestDispatcher, topic: str, subtopics: List[str]):
+    """Request the roadmap and resources concurrently."""
+    return await asyncio.gather(
+        cached_ainvoke_json(
+            dispatcher, get_roadmap_prompt(topic, subtopics), max_tokens=MAX_TOKENS["roadmap"]
+        ),
+        cached_ainvoke_json(
+            dispatcher, get_resources_prompt(topic, subtopics), max_tokens=MAX_TOKENS["resources"]
+        ),
+    )
+
+def start_learning_material(topic: str, subtopics: Tuple[str, ...]) -> concurrent.futures.Future:
+    """Start fetching the raw (roadmap, resources) responses in the background."""
+    return asyncio.run_coroutine_threadsafe(
+        gather_learning_material(get_dispatcher(), topic, list(subtopics)),
+        get_event_loop(),
+    )
+
+# Small talk that is answered without a round-trip to the LLM
+GREETINGS = frozenset({"hi", "hello", "hey", "hi there", "hello there", "good morning", "good afternoon", "good evening"})
+THANKS = frozenset({"thanks", "thank you", "thanks a lot", "thx", "ty", "ok thanks"})
+
+# General fact lookups do not depend on the user's prerequisite levels
+FACT_CHECK_PATTERN = re.compile(
+    r"^\s*(who|when\s+(was|were|did)|what\s+year|what\s+does\s+.+\s+stand\s+for)\b",
+    re.IGNORECASE,
+)
+
+def get_canned_reply(prompt: str, topic: str) -> Optional[str]:
+    """Return a fixed reply for greetings and thanks, or None if the LLM is needed."""
+    text = prompt.lower().strip(" .!?")
+    if not text:
+        return f"What would you like to know about {topic}?"
+    if text in GREETINGS:
+        return f"Hi! What would you like to learn about {topic}?"
+    if text in THANKS:
+        return f"You're welcome! Ask me anything else about {topic}."
+    return None